@@ -5,33 +5,239 @@ Handles processing and analysis of scraped articles.
 
 import logging
 import re
-from typing import List, Dict, Optional
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime
-import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Keyword categories reported by ArticleProcessor._scan
+AI_CATEGORY = 'ai'
+SPAM_CATEGORY = 'spam'
+TOPIC_CATEGORY = 'topic'
+
+class _PunctuationTable(dict):
+    """
+    str.translate table that deletes every character that is not a word character or whitespace.
+    
+    Entries are computed on first use, so only characters actually seen are stored.
+    """
+    
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        value = codepoint if char.isalnum() or char == '_' or char.isspace() else None
+        self[codepoint] = value
+        return value
+
+# Characters stripped from titles before deduplication
+_PUNCT_TABLE = _PunctuationTable()
+
+# Sentence boundaries used for extractive summaries
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+def _iter_sentences(text: str):
+    """Lazily split text on sentence boundaries (like re.split, without building a list)."""
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+# Try to import the Aho-Corasick automaton (C extension)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+class KeywordMatcher:
+    """
+    Finds which keywords of a fixed set occur in a text.
+    
+    With pyahocorasick installed all keywords are matched in a single pass
+    over the text; otherwise each keyword is checked with a substring test.
+    """
+    
+    def __init__(self, keywords: Dict[str, Any]):
+        """
+        Build the matcher.
+        
+        Args:
+            keywords: Mapping of lowercase keyword to the value reported when it matches
+        """
+        self.keywords = dict(keywords)
+        self._automaton = None
+        
+        if AHOCORASICK_AVAILABLE and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, value in self.keywords.items():
+                self._automaton.add_word(keyword, value)
+            self._automaton.make_automaton()
+    
+    def find(self, text: str) -> set:
+        """
+        Find the keywords occurring in a text.
+        
+        Args:
+            text: Lowercase text to search
+            
+        Returns:
+            Set of values for every keyword found in the text
+        """
+        if self._automaton is not None:
+            return {value for _, value in self._automaton.iter(text)}
+        return {value for keyword, value in self.keywords.items() if keyword in text}
+
+@lru_cache(maxsize=None)
+def _get_keyword_matcher(keywords: Tuple[Tuple[str, Any], ...]) -> KeywordMatcher:
+    """Return a matcher for the given (keyword, value) pairs, shared between processors."""
+    return KeywordMatcher(dict(keywords))
+
+# Keywords that indicate AI/tech relevance
+AI_KEYWORDS = (
+    'artificial intelligence', 'ai', 'machine learning', 'ml', 'deep learning',
+    'neural network', 'algorithm', 'automation', 'chatgpt', 'openai', 'gemini',
+    'llm', 'large language model', 'natural language processing', 'nlp',
+    'computer vision', 'robotics', 'data science', 'tensorflow', 'pytorch',
+    'generative ai', 'gpt', 'transformer', 'anthropic', 'claude', 'midjourney',
+    'stable diffusion', 'tech', 'technology', 'startup', 'silicon valley'
+)
+
+# Words that might indicate low-quality content
+SPAM_KEYWORDS = (
+    'click here', 'buy now', 'limited time', 'exclusive offer',
+    'advertisement', 'sponsored content', 'affiliate'
+)
+
+# Topic mappings
+TOPIC_KEYWORDS = {
+    'Machine Learning': ('machine learning', 'ml', 'neural network', 'deep learning'),
+    'AI Research': ('research', 'study', 'paper', 'arxiv', 'academic'),
+    'OpenAI': ('openai', 'chatgpt', 'gpt-4', 'gpt-3', 'dall-e'),
+    'Google AI': ('google', 'gemini', 'bard', 'deepmind', 'tensorflow'),
+    'Computer Vision': ('computer vision', 'image recognition', 'opencv', 'vision'),
+    'NLP': ('natural language processing', 'nlp', 'language model', 'text'),
+    'Robotics': ('robot', 'robotics', 'autonomous', 'automation'),
+    'Startups': ('startup', 'funding', 'investment', 'venture capital'),
+    'Big Tech': ('microsoft', 'apple', 'amazon', 'meta', 'facebook'),
+    'Ethics': ('ethics', 'bias', 'fairness', 'responsible ai'),
+    'Hardware': ('chip', 'gpu', 'nvidia', 'processor', 'hardware'),
+    'Software': ('software', 'platform', 'api', 'framework', 'tool')
+}
+
+def _build_keyword_tags(ai_keywords, spam_keywords, topic_keywords) -> Tuple[Tuple[str, Tuple], ...]:
+    """
+    Tag every keyword with its categories, so one scan finds all of them.
+    
+    Returns:
+        Tuple of (keyword, ((category, label), ...)) pairs
+    """
+    keyword_tags = {}
+    for keyword in ai_keywords:
+        keyword_tags.setdefault(keyword, []).append((AI_CATEGORY, keyword))
+    for keyword in spam_keywords:
+        keyword_tags.setdefault(keyword, []).append((SPAM_CATEGORY, keyword))
+    for topic, keywords in topic_keywords.items():
+        for keyword in keywords:
+            keyword_tags.setdefault(keyword, []).append((TOPIC_CATEGORY, topic))
+    return tuple((keyword, tuple(tags)) for keyword, tags in keyword_tags.items())
+
+KEYWORD_TAGS = _build_keyword_tags(AI_KEYWORDS, SPAM_KEYWORDS, TOPIC_KEYWORDS)
+MAX_KEYWORD_LENGTH = max((len(keyword) for keyword, _ in KEYWORD_TAGS), default=0)
+
 class ArticleProcessor:
     """
     Processes and analyzes articles for quality, relevance, and content.
     """
     
     def __init__(self):
-        # Keywords that indicate AI/tech relevance
-        self.ai_keywords = [
-            'artificial intelligence', 'ai', 'machine learning', 'ml', 'deep learning',
-            'neural network', 'algorithm', 'automation', 'chatgpt', 'openai', 'gemini',
-            'llm', 'large language model', 'natural language processing', 'nlp',
-            'computer vision', 'robotics', 'data science', 'tensorflow', 'pytorch',
-            'generative ai', 'gpt', 'transformer', 'anthropic', 'claude', 'midjourney',
-            'stable diffusion', 'tech', 'technology', 'startup', 'silicon valley'
-        ]
-        
-        # Words that might indicate low-quality content
-        self.spam_keywords = [
-            'click here', 'buy now', 'limited time', 'exclusive offer',
-            'advertisement', 'sponsored content', 'affiliate'
-        ]
+        self.ai_keywords = AI_KEYWORDS
+        self.spam_keywords = SPAM_KEYWORDS
+        self.topic_keywords = TOPIC_KEYWORDS
+        
+        # The keyword tables are shared, so every instance reuses one matcher
+        self._matcher = _get_keyword_matcher(KEYWORD_TAGS)
+        self._max_keyword_length = MAX_KEYWORD_LENGTH
+    
+    def _scan(self, text: str) -> Dict[str, set]:
+        """
+        Find all keyword categories in a text with a single scan.
+        
+        Args:
+            text: Lowercase text to scan
+            
+        Returns:
+            Dictionary mapping each category to the set of matched keywords (topic labels for topics)
+        """
+        hits = {AI_CATEGORY: set(), SPAM_CATEGORY: set(), TOPIC_CATEGORY: set()}
+        for tags in self._matcher.find(text):
+            for category, label in tags:
+                hits[category].add(label)
+        return hits
+    
+    def _scan_joined(self, parts: List[str], part_hits: List[Dict[str, set]]) -> Dict[str, set]:
+        """
+        Get the scan results of ' '.join(parts) from the scans of the parts.
+        
+        Only the short windows around each separator are scanned again, to
+        catch keywords spanning two parts.
+        
+        Args:
+            parts: Lowercase texts that were scanned separately
+            part_hits: Scan results for each part
+            
+        Returns:
+            Scan results for the joined text
+        """
+        hits = {category: set().union(*(h[category] for h in part_hits)) for category in part_hits[0]}
+        
+        joined = ' '.join(parts)
+        reach = self._max_keyword_length - 1
+        separator = -1
+        for part in parts[:-1]:
+            separator += len(part) + 1
+            window = joined[max(0, separator - reach):separator + reach + 1]
+            for category, labels in self._scan(window).items():
+                hits[category] |= labels
+        
+        return hits
+    
+    def _analyze(self, article: Dict, want_score: bool = True,
+                 want_topics: bool = True) -> Tuple[Optional[float], Optional[List[str]]]:
+        """
+        Score an article and/or extract its topics, scanning each text field once.
+        
+        Args:
+            article: Article dictionary
+            want_score: Whether to compute the relevance score
+            want_topics: Whether to extract topics
+            
+        Returns:
+            Tuple of (relevance score, topics), with None for anything not requested
+        """
+        title = article.get('title', '').lower()
+        content = article.get('content', '')
+        lowered_content = content.lower()
+        
+        title_hits = self._scan(title)
+        content_hits = self._scan(lowered_content)
+        
+        score = None
+        if want_score:
+            # The score covers the excerpt too; the title's hits also decide the title bonus
+            excerpt = article.get('excerpt', '').lower()
+            fields = [title, excerpt, lowered_content]
+            hits = self._scan_joined(fields, [title_hits, self._scan(excerpt), content_hits])
+            score = self._score_hits(hits, title_hits, len(content))
+        
+        topics = None
+        if want_topics:
+            hits = self._scan_joined([title, lowered_content], [title_hits, content_hits])
+            topics = self._topics_from_hits(hits)
+        
+        return score, topics
     
     def calculate_relevance_score(self, article: Dict) -> float:
         """
@@ -43,33 +249,37 @@ class ArticleProcessor:
         Returns:
             Relevance score (0.0 to 1.0)
         """
-        score = 0.0
-        total_text = f"{article.get('title', '')} {article.get('excerpt', '')} {article.get('content', '')}"
-        total_text = total_text.lower()
+        return self._analyze(article, want_topics=False)[0]
+    
+    def _score_hits(self, hits: Dict[str, set], title_hits: Dict[str, set], content_length: int) -> float:
+        """
+        Compute the relevance score from keyword scan results.
         
-        # Check for AI keywords
-        keyword_matches = 0
-        for keyword in self.ai_keywords:
-            if keyword in total_text:
-                keyword_matches += 1
+        Args:
+            hits: Scan results for the whole article text
+            title_hits: Scan results for the title alone
+            content_length: Length of the article content
+            
+        Returns:
+            Relevance score (0.0 to 1.0)
+        """
+        score = 0.0
         
         # Base score from keyword density
+        keyword_matches = len(hits[AI_CATEGORY])
         if len(self.ai_keywords) > 0:
             score += (keyword_matches / len(self.ai_keywords)) * 0.7
         
         # Bonus for title containing AI keywords
-        title_lower = article.get('title', '').lower()
-        title_keywords = sum(1 for keyword in self.ai_keywords if keyword in title_lower)
-        if title_keywords > 0:
+        if title_hits[AI_CATEGORY]:
             score += 0.2
         
         # Penalty for spam indicators
-        spam_matches = sum(1 for spam_word in self.spam_keywords if spam_word in total_text)
+        spam_matches = len(hits[SPAM_CATEGORY])
         if spam_matches > 0:
             score -= spam_matches * 0.1
         
         # Content length bonus (longer articles tend to be more substantial)
-        content_length = len(article.get('content', ''))
         if content_length > 1000:
             score += 0.1
         elif content_length > 500:
@@ -88,29 +298,11 @@ class ArticleProcessor:
         Returns:
             List of extracted topics
         """
-        text = f"{article.get('title', '')} {article.get('content', '')}".lower()
-        
-        # Topic mappings
-        topic_keywords = {
-            'Machine Learning': ['machine learning', 'ml', 'neural network', 'deep learning'],
-            'AI Research': ['research', 'study', 'paper', 'arxiv', 'academic'],
-            'OpenAI': ['openai', 'chatgpt', 'gpt-4', 'gpt-3', 'dall-e'],
-            'Google AI': ['google', 'gemini', 'bard', 'deepmind', 'tensorflow'],
-            'Computer Vision': ['computer vision', 'image recognition', 'opencv', 'vision'],
-            'NLP': ['natural language processing', 'nlp', 'language model', 'text'],
-            'Robotics': ['robot', 'robotics', 'autonomous', 'automation'],
-            'Startups': ['startup', 'funding', 'investment', 'venture capital'],
-            'Big Tech': ['microsoft', 'apple', 'amazon', 'meta', 'facebook'],
-            'Ethics': ['ethics', 'bias', 'fairness', 'responsible ai'],
-            'Hardware': ['chip', 'gpu', 'nvidia', 'processor', 'hardware'],
-            'Software': ['software', 'platform', 'api', 'framework', 'tool']
-        }
-        
-        detected_topics = []
-        for topic, keywords in topic_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                detected_topics.append(topic)
-        
+        return self._analyze(article, want_score=False)[1]
+    
+    def _topics_from_hits(self, hits: Dict[str, set]) -> List[str]:
+        """Select topics from keyword scan results, in the order of the topic mapping."""
+        detected_topics = [topic for topic in self.topic_keywords if topic in hits[TOPIC_CATEGORY]]
         return detected_topics[:5]  # Limit to 5 topics
     
     def generate_summary(self, article: Dict, max_length: int = 300) -> str:
@@ -129,12 +321,12 @@ class ArticleProcessor:
             return article.get('excerpt', '')[:max_length]
         
         # Simple extractive summarization
-        sentences = re.split(r'[.!?]+', content)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        sentences = (s.strip() for s in _iter_sentences(content))
+        sentences = (s for s in sentences if len(s) > 20)
         
         # Take first few sentences that fit within max_length
         summary = ""
-        for sentence in sentences[:3]:  # Max 3 sentences
+        for sentence in islice(sentences, 3):  # Max 3 sentences
             if len(summary + sentence) < max_length:
                 summary += sentence + ". "
             else:
@@ -142,6 +334,17 @@ class ArticleProcessor:
         
         return summary.strip() or article.get('excerpt', '')[:max_length]
     
+    @staticmethod
+    def _dedup_key(article: Dict) -> Tuple[str, str]:
+        """Build the key identifying duplicate articles: normalized title and URL."""
+        title = article.get('title', '').lower().strip()
+        url = article.get('url', '').strip()
+        
+        # Normalize title (remove common words, punctuation)
+        normalized_title = ' '.join(title.translate(_PUNCT_TABLE).split())
+        
+        return normalized_title, url
+    
     def deduplicate_articles(self, articles: List[Dict]) -> List[Dict]:
         """
         Remove duplicate articles based on title similarity and URL.
@@ -152,22 +355,14 @@ class ArticleProcessor:
         Returns:
             Deduplicated list of articles
         """
-        seen_hashes = set()
+        seen_keys = set()
         unique_articles = []
         
         for article in articles:
-            # Create hash based on title and URL
-            title = article.get('title', '').lower().strip()
-            url = article.get('url', '').strip()
-            
-            # Normalize title (remove common words, punctuation)
-            normalized_title = re.sub(r'[^\w\s]', '', title)
-            normalized_title = ' '.join(normalized_title.split())
+            dedup_key = self._dedup_key(article)
             
-            content_hash = hashlib.md5(f"{normalized_title}|{url}".encode()).hexdigest()
-            
-            if content_hash not in seen_hashes:
-                seen_hashes.add(content_hash)
+            if dedup_key not in seen_keys:
+                seen_keys.add(dedup_key)
                 unique_articles.append(article)
         
         logger.info(f"Deduplicated: {len(articles)} -> {len(unique_articles)} articles")
@@ -194,17 +389,18 @@ class ArticleProcessor:
                 quality_articles.append(article)
         
         # Sort by relevance score (highest first)
-        quality_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
+        quality_articles.sort(key=itemgetter('relevance_score'), reverse=True)
         
         logger.info(f"Quality filter: {len(articles)} -> {len(quality_articles)} articles")
         return quality_articles
     
-    def process_articles(self, articles: List[Dict]) -> List[Dict]:
+    def process_articles(self, articles: List[Dict], min_score: float = 0.3) -> List[Dict]:
         """
         Process a list of articles: deduplicate, filter, and enhance.
         
         Args:
             articles: Raw articles from scraper
+            min_score: Minimum relevance score
             
         Returns:
             Processed and enhanced articles
@@ -214,23 +410,38 @@ class ArticleProcessor:
         
         logger.info(f"Processing {len(articles)} articles...")
         
-        # Step 1: Deduplicate
-        articles = self.deduplicate_articles(articles)
-        
-        # Step 2: Filter by quality
-        articles = self.filter_by_quality(articles)
+        seen_keys = set()
+        unique_count = 0
+        processed_articles = []
+        processed_at = datetime.now().isoformat()
         
-        # Step 3: Enhance each article
+        # Deduplicate, score, and enhance each article in a single pass
         for article in articles:
-            # Extract topics
-            article['topics'] = self.extract_topics(article)
+            dedup_key = self._dedup_key(article)
+            if dedup_key in seen_keys:
+                continue
+            seen_keys.add(dedup_key)
+            unique_count += 1
+            
+            score, topics = self._analyze(article)
+            article['relevance_score'] = score
+            if score < min_score:
+                continue
+            
+            article['topics'] = topics
             
             # Generate summary if not exists
             if not article.get('summary'):
                 article['summary'] = self.generate_summary(article)
             
             # Add processing timestamp
-            article['processed_at'] = datetime.now().isoformat()
+            article['processed_at'] = processed_at
+            processed_articles.append(article)
+        
+        # Sort by relevance score (highest first)
+        processed_articles.sort(key=itemgetter('relevance_score'), reverse=True)
         
-        logger.info(f"Finished processing: {len(articles)} articles ready")
-        return articles
+        logger.info(f"Deduplicated: {len(articles)} -> {unique_count} articles")
+        logger.info(f"Quality filter: {unique_count} -> {len(processed_articles)} articles")
+        logger.info(f"Finished processing: {len(processed_articles)} articles ready")
+        return processed_articles
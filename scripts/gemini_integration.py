@@ -4,7 +4,12 @@ Provides AI-powered article summarization and analysis using Google's Gemini API
 """
 
 import os
+import json
+import hashlib
 import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import time
 
@@ -18,21 +23,172 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logger.warning("Google Generative AI not available. Install with: pip install google-generativeai")
 
+GEMINI_CACHE_PATH = 'gemini_cache.sqlite'
+GEMINI_CACHE_MAX_ENTRIES = 10_000  # Most recently stored results kept in the cache
+DEFAULT_REQUESTS_PER_MINUTE = 60  # Used when GEMINI_RPM is not set
+
+# Gemini prompt templates (static text is built once, at import)
+_SUMMARY_PROMPT = """
+            Please provide a concise, professional summary of the following AI/technology article.
+            Focus on the key points, implications, and relevance to AI professionals.
+            Keep the summary between 100-{max_length} words.
+            Make it engaging and informative.
+            
+            Title: {title}
+            
+            Content: {content}
+            
+            Summary:
+            """
+
+_TOPICS_PROMPT = """
+            Analyze the following AI/technology article and extract 3-5 relevant topics or tags.
+            Focus on specific technologies, companies, concepts, or trends mentioned.
+            Return only the topics as a comma-separated list, no explanations.
+            Make topics specific and relevant to AI professionals.
+            
+            Title: {title}
+            
+            Content: {content}
+            
+            Topics (comma-separated):
+            """
+
+_INTRO_PROMPT = """
+            Write a brief, engaging introduction for an AI newsletter called "QuanticDaily".
+            The newsletter covers the following articles this week:
+            {articles}
+            
+            Key topics covered: {topics}
+            
+            Requirements:
+            - Keep it under 100 words
+            - Professional but engaging tone
+            - Highlight the most interesting trends or developments
+            - Don't just list the articles, provide insight
+            - Start with a compelling hook about the week in AI
+            
+            Introduction:
+            """
+
+_BATCH_PROMPT = """
+            For each of the following AI/technology articles, write a concise, professional summary
+            of 100-200 words focusing on the key points, implications, and relevance to AI professionals,
+            and extract 3-5 specific topics or tags (technologies, companies, concepts, or trends).
+            
+            Return only a JSON list with one object per article, in the same order.
+            Each object must have the keys "summary" (a string) and "topics" (a list of strings).
+            
+            {articles}
+            """
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket allowing bursts of up to max_rate calls per time_period.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 60):
+        self.capacity = max_rate
+        self.fill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until another call is allowed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.fill_rate
+            
+            time.sleep(wait)
+
+class ResponseCache:
+    """
+    SQLite-backed cache of Gemini results, so re-runs over the same articles skip the API.
+    """
+    
+    def __init__(self, path: str, max_entries: int = GEMINI_CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, value TEXT)')
+        # INSERT OR REPLACE gives every write a new rowid, so the lowest rowids are the oldest writes
+        self._conn.execute(
+            'DELETE FROM responses WHERE rowid NOT IN '
+            '(SELECT rowid FROM responses ORDER BY rowid DESC LIMIT ?)', (max_entries,)
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def key(kind: str, *fields) -> bytes:
+        """Build a compact cache key from a request kind and its inputs."""
+        digest = hashlib.blake2b(digest_size=16)
+        for field in fields:
+            digest.update(str(field).encode('utf-8', 'surrogatepass'))
+            digest.update(b'\0')
+        return kind.encode() + b':' + digest.digest()
+    
+    def get(self, key: bytes):
+        """Return the cached value for a key, or None if missing or unreadable."""
+        try:
+            with self._lock:
+                row = self._conn.execute('SELECT value FROM responses WHERE key = ?', (key,)).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Error reading Gemini cache: {e}")
+            return None
+    
+    def store(self, key: bytes, value):
+        """Store a JSON-serializable value under a key, logging rather than raising on failure."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)', (key, json.dumps(value))
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing Gemini cache: {e}")
+
 class GeminiSummarizer:
     """
     Uses Google's Gemini API for article summarization and content enhancement.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, force_refresh: Optional[bool] = None):
         """
         Initialize Gemini summarizer.
         
         Args:
             api_key: Gemini API key (if not provided, will try to get from environment)
+            force_refresh: Ignore cached results and call the API again
+                (defaults to the GEMINI_FORCE_REFRESH environment variable)
         """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         self.model = None
-        self.rate_limit_delay = 1  # Delay between API calls (seconds)
+        self._cache = None
+        
+        # API rate limit; a malformed or non-positive GEMINI_RPM falls back to something usable
+        try:
+            requests_per_minute = int(os.getenv('GEMINI_RPM', DEFAULT_REQUESTS_PER_MINUTE))
+        except ValueError:
+            logger.warning(f"Invalid GEMINI_RPM value, using {DEFAULT_REQUESTS_PER_MINUTE}")
+            requests_per_minute = DEFAULT_REQUESTS_PER_MINUTE
+        self.requests_per_minute = max(1, requests_per_minute)
+        self._limiter = _RateLimiter(self.requests_per_minute)
+        self.batch_size = 5  # Articles enhanced per API call
+        self.max_concurrent_requests = 3  # Batches sent to the API in parallel
+        
+        if force_refresh is None:
+            force_refresh = os.getenv('GEMINI_FORCE_REFRESH', '').lower() in ('1', 'true', 'yes')
+        self.force_refresh = force_refresh
         
         if not GEMINI_AVAILABLE:
             logger.error("Gemini API not available")
@@ -48,11 +204,57 @@ class GeminiSummarizer:
             logger.info("Gemini API initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini API: {e}")
+            return
+        
+        # Cache of previous results, only needed once the API can be used
+        try:
+            self._cache = ResponseCache(GEMINI_CACHE_PATH)
+        except sqlite3.Error as e:
+            logger.warning(f"Gemini cache disabled: {e}")
     
     def is_available(self) -> bool:
         """Check if Gemini API is available and configured."""
         return GEMINI_AVAILABLE and self.model is not None
     
+    @staticmethod
+    def _limit_words(summary: str, max_length: int) -> str:
+        """Ensure a summary isn't longer than max_length words."""
+        words = summary.split()
+        if len(words) > max_length:
+            summary = ' '.join(words[:max_length]) + '...'
+        return summary
+    
+    @staticmethod
+    def _clean_topics(topics: List[str]) -> List[str]:
+        """Clean and filter topics returned by Gemini."""
+        clean_topics = []
+        for topic in topics:
+            topic = str(topic).strip()
+            if topic and len(topic) > 2 and len(topic) < 30:
+                clean_topics.append(topic.title())
+        return clean_topics[:5]
+    
+    def _cached(self, key: bytes):
+        """Return a cached result, unless caching is disabled or a refresh is forced."""
+        if self._cache is None or self.force_refresh:
+            return None
+        return self._cache.get(key)
+    
+    def _remember(self, key: bytes, value):
+        """Store a result in the cache, if enabled."""
+        if self._cache is not None:
+            self._cache.store(key, value)
+    
+    @staticmethod
+    def _summary_key(title: str, content: str, max_length: int) -> bytes:
+        """Cache key for a summary of an article."""
+        return ResponseCache.key('summary', title, content[:3000], max_length)
+    
+    @staticmethod
+    def _topics_key(title: str, content: str) -> bytes:
+        """Cache key for the topics of an article."""
+        return ResponseCache.key('topics', title, content[:2000])
+    
     def summarize_article(self, title: str, content: str, max_length: int = 250) -> str:
         """
         Generate a summary of an article using Gemini.
@@ -68,28 +270,21 @@ class GeminiSummarizer:
         if not self.is_available():
             return f"Summary not available: {content[:max_length]}..."
         
+        excerpt = content[:3000]
+        cache_key = self._summary_key(title, content, max_length)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            Please provide a concise, professional summary of the following AI/technology article.
-            Focus on the key points, implications, and relevance to AI professionals.
-            Keep the summary between 100-{max_length} words.
-            Make it engaging and informative.
-            
-            Title: {title}
-            
-            Content: {content[:3000]}
-            
-            Summary:
-            """
+            prompt = _SUMMARY_PROMPT.format(max_length=max_length, title=title, content=excerpt)
             
+            self._limiter.acquire()
             response = self.model.generate_content(prompt)
             
             if response.text:
-                summary = response.text.strip()
-                # Ensure summary isn't too long
-                words = summary.split()
-                if len(words) > max_length:
-                    summary = ' '.join(words[:max_length]) + '...'
+                summary = self._limit_words(response.text.strip(), max_length)
+                self._remember(cache_key, summary)
                 return summary
             else:
                 logger.warning("Empty response from Gemini")
@@ -98,9 +293,6 @@ class GeminiSummarizer:
         except Exception as e:
             logger.error(f"Error generating summary with Gemini: {e}")
             return content[:max_length] + "..."
-        finally:
-            # Rate limiting
-            time.sleep(self.rate_limit_delay)
     
     def extract_topics(self, title: str, content: str) -> List[str]:
         """
@@ -116,31 +308,23 @@ class GeminiSummarizer:
         if not self.is_available():
             return ["AI", "Technology"]
         
+        excerpt = content[:2000]
+        cache_key = self._topics_key(title, content)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            Analyze the following AI/technology article and extract 3-5 relevant topics or tags.
-            Focus on specific technologies, companies, concepts, or trends mentioned.
-            Return only the topics as a comma-separated list, no explanations.
-            Make topics specific and relevant to AI professionals.
-            
-            Title: {title}
-            
-            Content: {content[:2000]}
-            
-            Topics (comma-separated):
-            """
+            prompt = _TOPICS_PROMPT.format(title=title, content=excerpt)
             
+            self._limiter.acquire()
             response = self.model.generate_content(prompt)
             
             if response.text:
                 topics_text = response.text.strip()
-                topics = [topic.strip() for topic in topics_text.split(',')]
-                # Clean and filter topics
-                clean_topics = []
-                for topic in topics:
-                    if topic and len(topic) > 2 and len(topic) < 30:
-                        clean_topics.append(topic.title())
-                return clean_topics[:5]
+                topics = self._clean_topics(topics_text.split(','))
+                self._remember(cache_key, topics)
+                return topics
             else:
                 logger.warning("Empty topics response from Gemini")
                 return ["AI", "Technology"]
@@ -148,9 +332,6 @@ class GeminiSummarizer:
         except Exception as e:
             logger.error(f"Error extracting topics with Gemini: {e}")
             return ["AI", "Technology"]
-        finally:
-            # Rate limiting
-            time.sleep(self.rate_limit_delay)
     
     def generate_newsletter_intro(self, articles: List[Dict]) -> str:
         """
@@ -176,38 +357,32 @@ class GeminiSummarizer:
                 all_topics.extend(topics)
                 article_summaries.append(f"- {title}")
             
-            # Get unique topics
-            unique_topics = list(set(all_topics))
+            # Get unique topics, in a stable order so the prompt can be cached
+            unique_topics = list(dict.fromkeys(all_topics))
             
-            prompt = f"""
-            Write a brief, engaging introduction for an AI newsletter called "QuanticDaily".
-            The newsletter covers the following articles this week:
-            {chr(10).join(article_summaries)}
+            prompt = _INTRO_PROMPT.format(
+                articles='\n'.join(article_summaries),
+                topics=', '.join(unique_topics[:8])
+            )
             
-            Key topics covered: {', '.join(unique_topics[:8])}
-            
-            Requirements:
-            - Keep it under 100 words
-            - Professional but engaging tone
-            - Highlight the most interesting trends or developments
-            - Don't just list the articles, provide insight
-            - Start with a compelling hook about the week in AI
-            
-            Introduction:
-            """
+            cache_key = ResponseCache.key('intro', prompt)
+            cached = self._cached(cache_key)
+            if cached is not None:
+                return cached
             
+            self._limiter.acquire()
             response = self.model.generate_content(prompt)
             
             if response.text:
-                return response.text.strip()
+                intro = response.text.strip()
+                self._remember(cache_key, intro)
+                return intro
             else:
                 return "Welcome to this week's AI news roundup. Here are the latest developments in artificial intelligence and technology."
                 
         except Exception as e:
             logger.error(f"Error generating newsletter intro with Gemini: {e}")
             return "Welcome to this week's AI news roundup. Here are the latest developments in artificial intelligence and technology."
-        finally:
-            time.sleep(self.rate_limit_delay)
     
     def enhance_articles(self, articles: List[Dict]) -> List[Dict]:
         """
@@ -223,37 +398,127 @@ class GeminiSummarizer:
             logger.warning("Gemini not available, returning articles unchanged")
             return articles
         
-        enhanced_articles = []
+        enhanced_articles = [article.copy() for article in articles]
+        
+        # Fill in results cached by earlier runs
+        for article in enhanced_articles:
+            self._apply_cached(article)
+        
+        # Only articles still missing a summary or topics need an API call
+        pending = [
+            article for article in enhanced_articles
+            if self._needs_summary(article) or not article.get('topics')
+        ]
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
         
-        for i, article in enumerate(articles):
+        if batches:
+            logger.info(f"Enhancing {len(pending)} articles in {len(batches)} batches...")
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrent_requests, len(batches))) as executor:
+                list(executor.map(self._enhance_batch, batches))
+        
+        return enhanced_articles
+    
+    def _apply_cached(self, article: Dict):
+        """Set a missing summary or topics on an article from the cache, if present."""
+        title = article.get('title', '')
+        content = article.get('content', '')
+        
+        if self._needs_summary(article):
+            summary = self._cached(self._summary_key(title, content, 200))
+            if summary:
+                article['summary'] = summary
+        
+        if not article.get('topics'):
+            topics = self._cached(self._topics_key(title, content))
+            if topics:
+                article['topics'] = topics
+    
+    @staticmethod
+    def _needs_summary(article: Dict) -> bool:
+        """Check if an article has no summary or one that is too short."""
+        current_summary = article.get('summary', '')
+        return not current_summary or len(current_summary) < 50
+    
+    def _generate_batch_enhancements(self, articles: List[Dict]) -> Optional[List[Dict]]:
+        """
+        Generate summaries and topics for several articles with a single Gemini request.
+        
+        Args:
+            articles: List of article dictionaries
+            
+        Returns:
+            One dictionary with 'summary' and 'topics' per article, or None on failure
+        """
+        try:
+            article_texts = []
+            for i, article in enumerate(articles, 1):
+                article_texts.append(
+                    f"Article {i}\n"
+                    f"Title: {article.get('title', '')}\n"
+                    f"Content: {article.get('content', '')[:3000]}"
+                )
+            
+            prompt = _BATCH_PROMPT.format(articles='\n\n'.join(article_texts))
+            
+            self._limiter.acquire()
+            response = self.model.generate_content(
+                prompt,
+                generation_config={'response_mime_type': 'application/json'}
+            )
+            
+            text = response.text.strip()
+            if text.startswith('```'):
+                # Strip a Markdown code fence around the JSON
+                text = text.strip('`')
+                text = text[4:] if text.startswith('json') else text
+            
+            results = json.loads(text)
+            if (isinstance(results, list) and len(results) == len(articles)
+                    and all(isinstance(result, dict) for result in results)):
+                return results
+            
+            logger.warning("Unexpected batch response format from Gemini")
+            return None
+            
+        except Exception as e:
+            logger.warning(f"Error generating batch enhancements with Gemini: {e}")
+            return None
+    
+    def _enhance_batch(self, articles: List[Dict]):
+        """
+        Add Gemini-generated summaries and topics to a batch of articles in place.
+        
+        Fields missing from the batch response are generated one article at a time.
+        
+        Args:
+            articles: List of article dictionaries
+        """
+        results = self._generate_batch_enhancements(articles) or [{}] * len(articles)
+        
+        for article, result in zip(articles, results):
             try:
-                logger.info(f"Enhancing article {i+1}/{len(articles)}: {article.get('title', 'No title')[:50]}...")
-                
-                enhanced_article = article.copy()
+                title = article.get('title', '')
+                content = article.get('content', '')
                 
                 # Generate summary if not exists or is too short
-                current_summary = article.get('summary', '')
-                if not current_summary or len(current_summary) < 50:
-                    enhanced_article['summary'] = self.summarize_article(
-                        article.get('title', ''),
-                        article.get('content', ''),
-                        max_length=200
-                    )
+                if self._needs_summary(article):
+                    summary = result.get('summary')
+                    if isinstance(summary, str) and summary.strip():
+                        article['summary'] = self._limit_words(summary.strip(), 200)
+                        self._remember(self._summary_key(title, content, 200), article['summary'])
+                    else:
+                        article['summary'] = self.summarize_article(title, content, max_length=200)
                 
                 # Extract topics if not exists
                 if not article.get('topics'):
-                    enhanced_article['topics'] = self.extract_topics(
-                        article.get('title', ''),
-                        article.get('content', '')
-                    )
-                
-                enhanced_articles.append(enhanced_article)
+                    topics = result.get('topics')
+                    topics = self._clean_topics(topics) if isinstance(topics, list) else []
+                    if topics:
+                        self._remember(self._topics_key(title, content), topics)
+                    article['topics'] = topics or self.extract_topics(title, content)
                 
             except Exception as e:
-                logger.error(f"Error enhancing article {i}: {e}")
-                enhanced_articles.append(article)  # Keep original if enhancement fails
-        
-        return enhanced_articles
+                logger.error(f"Error enhancing article {article.get('title', 'No title')[:50]}: {e}")
     
     def test_connection(self) -> bool:
         """
@@ -267,6 +532,7 @@ class GeminiSummarizer:
         
         try:
             test_prompt = "Hello, please respond with 'Gemini API is working'"
+            self._limiter.acquire()
             response = self.model.generate_content(test_prompt)
             
             if response.text and "working" in response.text.lower():
@@ -4,26 +4,261 @@ Handles scraping of AI news from various sources.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import json
 import logging
-from bs4 import BeautifulSoup
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup, NavigableString, Tag
+import soupsieve
 from urllib.parse import urljoin, urlparse
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from email.utils import parsedate_tz, mktime_tz
+from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Prefer the C-based lxml parser, fall back to Python's built-in parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Prefer orjson for decoding API responses, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_loads(data: bytes):
+    """Decode a JSON document from bytes."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def _print_json(data):
+    """Write data to stdout as indented JSON."""
+    if ORJSON_AVAILABLE:
+        # Write UTF-8 bytes directly, since orjson (unlike json.dumps) doesn't escape non-ASCII text
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b'\n')
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(data, indent=2))
+
+# Advertise Brotli only when a decoder is installed for it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# A listing page's article is kept only if its title mentions one of these
+TITLE_AI_KEYWORDS = (
+    'ai', 'artificial intelligence', 'machine learning', 'deep learning',
+    'neural', 'gpt', 'llm', 'chatbot', 'automation'
+)
+
+# Selectors tried when a source's title selector matches nothing
+FALLBACK_TITLE_SELECTORS = tuple(
+    soupsieve.compile(selector) for selector in ('h1', 'h2', 'h3', '.title', '[class*="title"]', 'a')
+)
+
+# Selectors tried in order to find an article's main content
+CONTENT_SELECTORS = tuple(
+    soupsieve.compile(selector) for selector in (
+        '.article-content',
+        '.entry-content',
+        '.post-content',
+        'article',
+        '.content',
+        '[class*="content"]'
+    )
+)
+
+# On-disk cache of fetched pages, revalidated with conditional requests
+HTTP_CACHE_PATH = 'scraper_cache.sqlite'
+HTTP_CACHE_TTL = 24 * 60 * 60  # Refetch cached pages older than this (seconds)
+HTTP_CACHE_MAX_AGE = 30 * 60  # Reuse cached pages younger than this without a request (seconds)
+API_CACHE_MAX_AGE = 5 * 60  # Shorter reuse window for frequently updated API listings (seconds)
+
+# Older feed and API items are skipped
+MAX_ARTICLE_AGE = timedelta(days=7)
+
+# Upper bound on any downloaded (decoded) response body
+MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+# Only this much of an article page is downloaded; the extracted text is cut to ARTICLE_MAX_CHARS anyway
+ARTICLE_MAX_BYTES = 512 * 1024
+ARTICLE_MAX_CHARS = 5000
+
+def _normalize_whitespace(text: str, limit: int) -> str:
+    """
+    Collapse whitespace runs to single spaces and cut the result to limit characters.
+    
+    Only a prefix of the text is normalized, grown until it yields enough characters.
+    """
+    end = 2 * limit
+    while True:
+        normalized = ' '.join(text[:end].split())
+        if len(normalized) >= limit or end >= len(text):
+            return normalized[:limit]
+        end *= 2
+
+def _node_text(node: Tag) -> str:
+    """
+    Same as node.get_text(strip=True), without walking the subtree when it holds a single string.
+    
+    Titles and links are usually a tag around one text node.
+    """
+    string = node.string
+    if string is not None and type(string) is NavigableString:
+        return string.strip()
+    return node.get_text(strip=True)
+
+# Placeholder articles returned by generate_fallback_articles (title, url, excerpt, source, content)
+FALLBACK_ARTICLES = (
+    (
+        'Major Breakthrough in AI Language Understanding',
+        'https://example.com/ai-breakthrough',
+        'Researchers announce significant improvements in AI reasoning capabilities and natural language understanding.',
+        'AI Research Today',
+        'Recent developments in artificial intelligence have led to unprecedented improvements in language model capabilities...'
+    ),
+    (
+        'New AI Regulations Proposed by Global Tech Leaders',
+        'https://example.com/ai-regulations',
+        'Technology leaders propose comprehensive framework for AI governance and safety standards.',
+        'Tech Policy News',
+        'Industry executives and policymakers are collaborating on new guidelines for responsible AI development...'
+    ),
+    (
+        'AI in Healthcare Shows Promising Clinical Trial Results',
+        'https://example.com/ai-healthcare',
+        'Medical AI applications demonstrate significant improvements in diagnostic accuracy and patient outcomes.',
+        'Medical AI Journal',
+        'Clinical trials of AI-powered diagnostic tools show remarkable success rates in early disease detection...'
+    ),
+    (
+        'The Ethics of Autonomous AI Systems Under Scrutiny',
+        'https://example.com/ai-ethics',
+        'Philosophers and technologists debate the moral implications of increasingly autonomous AI systems.',
+        'Philosophy & Tech',
+        'As AI systems become more autonomous, questions about responsibility and ethical decision-making become crucial...'
+    ),
+    (
+        'AI Transforms Creative Industries with New Generative Tools',
+        'https://example.com/creative-ai',
+        'Artists and creators embrace AI-powered tools for music, visual art, and content generation.',
+        'Creative Tech Weekly',
+        'The intersection of AI and creativity is producing innovative tools that enhance human artistic expression...'
+    ),
+    (
+        'Quantum Computing Breakthrough Accelerates AI Development',
+        'https://example.com/quantum-ai',
+        'New quantum algorithms show promise for solving complex AI problems exponentially faster than classical computers.',
+        'Quantum Tech News',
+        'Quantum computing researchers have developed new algorithms that could revolutionize machine learning and AI optimization...'
+    ),
+    (
+        'AI-Powered Climate Solutions Gain Global Recognition',
+        'https://example.com/ai-climate',
+        'Artificial intelligence is being deployed to tackle climate change through predictive modeling and optimization.',
+        'Climate Tech Weekly',
+        'Climate scientists and AI researchers are collaborating to develop solutions for monitoring and mitigating climate change...'
+    ),
+    (
+        'Edge AI Revolutionizes IoT and Mobile Applications',
+        'https://example.com/edge-ai',
+        'On-device AI processing is transforming how mobile and IoT devices operate with improved privacy and performance.',
+        'Edge Computing Today',
+        'Edge AI is enabling real-time processing on devices without requiring cloud connectivity, improving privacy and reducing latency...'
+    )
+)
+
+class _HTTPCache:
+    """
+    SQLite-backed cache of response bodies and their validators (ETag/Last-Modified).
+    """
+    
+    def __init__(self, path: str, ttl: float = HTTP_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses '
+            '(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, fetched_at REAL)'
+        )
+        # Expired rows are never served again, so drop them instead of letting the file grow
+        self._conn.execute('DELETE FROM responses WHERE fetched_at < ?', (time.time() - ttl,))
+        self._conn.commit()
+    
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], bytes, float]]:
+        """Return (etag, last_modified, body, fetched_at) for a URL, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, body, fetched_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+        
+        if not row or time.time() - row[3] > self.ttl:
+            return None
+        return row
+    
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        """Store a response body together with its validators."""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (url, etag, last_modified, body, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, etag, last_modified, body, time.time())
+            )
+            self._conn.commit()
+
 class AINewsScraper:
     """
     A scraper for AI news from various tech news sources.
     """
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialize the scraper.
+        
+        Args:
+            use_cache: Keep fetched pages in an on-disk cache between runs
+        """
+        # Concurrency and per-host politeness settings
+        self.max_workers = 8
+        self.host_delay = 2  # Minimum delay between requests to the same host (seconds)
+        self._host_lock = threading.Lock()
+        self._host_next_request = {}
+        
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING
         })
         
+        # Keep enough pooled connections per host for every worker, and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        self._http_cache = None
+        if use_cache:
+            try:
+                self._http_cache = _HTTPCache(HTTP_CACHE_PATH)
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache disabled: {e}")
+        
         # Common AI news sources with updated selectors
         self.sources = {
             'hacker_news_ai': {
@@ -60,6 +295,26 @@ class AINewsScraper:
                 'is_rss': True,  # RSS feed
             }
         }
+        
+        # Response parsers for the API sources
+        self._api_parsers = {
+            'hacker_news_ai': self._parse_hacker_news,
+            'reddit_ai': self._parse_reddit,
+        }
+        
+        # Compile every CSS selector once instead of on each lookup
+        self._selectors = {}
+        for source_config in self.sources.values():
+            for key, selector in source_config.items():
+                if key.endswith('_selector') and selector:
+                    self._compile_selector(selector)
+    
+    def _compile_selector(self, selector: str):
+        """Return the compiled form of a CSS selector, compiling it on first use."""
+        compiled = self._selectors.get(selector)
+        if compiled is None:
+            compiled = self._selectors[selector] = soupsieve.compile(selector)
+        return compiled
     
     def scrape_source(self, source_name: str, max_articles: int = 10) -> List[Dict]:
         """
@@ -90,42 +345,53 @@ class AINewsScraper:
             if source_config.get('is_rss'):
                 return self.scrape_rss_source(source_name, source_config, max_articles)
             
-            response = self.session.get(source_config['url'], timeout=15)
-            response.raise_for_status()
+            content = self._cached_get(source_config['url'])
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            article_elements = soup.select(source_config['article_selector'])
+            soup = BeautifulSoup(content, HTML_PARSER)
+            article_elements = self._compile_selector(source_config['article_selector']).select(soup)
             
             logger.info(f"Found {len(article_elements)} potential articles")
             
+            # Per-source settings are the same for every article
+            base_url = source_config['url']
+            title_selector = source_config['title_selector']
+            link_selector = source_config['link_selector']
+            excerpt_selector = source_config['excerpt_selector']
+            source_label = source_name.replace('_', ' ').title()
+            scraped_at = datetime.now().isoformat()
+            
             for i, element in enumerate(article_elements[:max_articles]):
                 try:
                     # Extract title - try multiple selectors
-                    title = self.extract_text_from_element(element, source_config['title_selector'])
+                    title_node, title = self._select_text(element, title_selector)
                     
-                    # Extract link
-                    link = self.extract_link_from_element(element, source_config['link_selector'], source_config['url'])
+                    # Skip elements without a meaningful, AI-related title before extracting anything else
+                    if not title or len(title) <= 10:
+                        continue
+                    title_lower = title.lower()
+                    if not any(keyword in title_lower for keyword in TITLE_AI_KEYWORDS):
+                        continue
+                    
+                    # Extract link - sources usually share the title selector, whose match is then the link
+                    if link_selector and link_selector == title_selector:
+                        link = self._resolve_link(title_node, base_url)
+                    else:
+                        link = self.extract_link_from_element(element, link_selector, base_url)
                     
                     # Extract excerpt
-                    excerpt = self.extract_text_from_element(element, source_config['excerpt_selector'])
+                    excerpt = self.extract_text_from_element(element, excerpt_selector)
+                    
+                    article = {
+                        'title': title,
+                        'url': link or base_url,
+                        'excerpt': excerpt[:200] if excerpt else f"Latest AI news: {title}",
+                        'source': source_label,
+                        'scraped_at': scraped_at,
+                        'content': excerpt[:500] if excerpt else f"Read the full article about {title}."
+                    }
+                    articles.append(article)
+                    logger.info(f"  Found AI article: {title[:50]}...")
                     
-                    if title and len(title) > 10:  # Ensure we have a meaningful title
-                        # Check if title contains AI-related keywords
-                        ai_keywords = ['ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural', 'gpt', 'llm', 'chatbot', 'automation']
-                        title_lower = title.lower()
-                        
-                        if any(keyword in title_lower for keyword in ai_keywords):
-                            article = {
-                                'title': title,
-                                'url': link or source_config['url'],
-                                'excerpt': excerpt[:200] if excerpt else f"Latest AI news: {title}",
-                                'source': source_name.replace('_', ' ').title(),
-                                'scraped_at': datetime.now().isoformat(),
-                                'content': excerpt[:500] if excerpt else f"Read the full article about {title}."
-                            }
-                            articles.append(article)
-                            logger.info(f"  Found AI article: {title[:50]}...")
-                        
                 except Exception as e:
                     logger.error(f"Error parsing article {i} from {source_name}: {e}")
                     continue
@@ -139,45 +405,14 @@ class AINewsScraper:
     
     def scrape_api_source(self, source_name: str, source_config: Dict, max_articles: int) -> List[Dict]:
         """Handle API-based sources like Hacker News and Reddit."""
+        parse = self._api_parsers.get(source_name)
+        if parse is None:
+            logger.error(f"No API parser for source: {source_name}")
+            return []
+        
         try:
-            response = self.session.get(source_config['url'], timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            
-            articles = []
-            
-            if source_name == 'hacker_news_ai':
-                hits = data.get('hits', [])
-                for hit in hits[:max_articles]:
-                    if hit.get('title') and hit.get('url'):
-                        # Filter for recent articles (last 7 days)
-                        created_at = hit.get('created_at_i', 0)
-                        if created_at > (datetime.now() - timedelta(days=7)).timestamp():
-                            articles.append({
-                                'title': hit['title'],
-                                'url': hit['url'],
-                                'excerpt': hit.get('story_text', '')[:200] or f"AI news from Hacker News: {hit['title']}",
-                                'source': 'Hacker News',
-                                'scraped_at': datetime.now().isoformat(),
-                                'content': hit.get('story_text', '')[:500] or f"Read more about {hit['title']} on Hacker News."
-                            })
-            
-            elif source_name == 'reddit_ai':
-                posts = data.get('data', {}).get('children', [])
-                for post in posts[:max_articles]:
-                    post_data = post.get('data', {})
-                    if post_data.get('title') and not post_data.get('is_self'):
-                        # Filter for recent posts (last 7 days)
-                        created_utc = post_data.get('created_utc', 0)
-                        if created_utc > (datetime.now() - timedelta(days=7)).timestamp():
-                            articles.append({
-                                'title': post_data['title'],
-                                'url': post_data.get('url', ''),
-                                'excerpt': post_data.get('selftext', '')[:200] or f"AI discussion from Reddit: {post_data['title']}",
-                                'source': 'Reddit r/artificial',
-                                'scraped_at': datetime.now().isoformat(),
-                                'content': post_data.get('selftext', '')[:500] or f"Join the discussion about {post_data['title']} on Reddit."
-                            })
+            data = _json_loads(self._cached_get(source_config['url'], max_age=API_CACHE_MAX_AGE))
+            articles = parse(data, max_articles)
             
             logger.info(f"API scraping returned {len(articles)} articles from {source_name}")
             return articles
@@ -186,16 +421,75 @@ class AINewsScraper:
             logger.error(f"Error scraping API source {source_name}: {e}")
             return []
     
+    def _parse_hacker_news(self, data: Dict, max_articles: int) -> List[Dict]:
+        """Build articles from a Hacker News (Algolia) search response."""
+        articles = []
+        now = datetime.now()
+        scraped_at = now.isoformat()
+        cutoff = (now - MAX_ARTICLE_AGE).timestamp()
+        
+        for hit in data.get('hits', [])[:max_articles]:
+            title = hit.get('title')
+            url = hit.get('url')
+            if not title or not url:
+                continue
+            
+            # Filter for recent articles (last 7 days)
+            created_at = hit.get('created_at_i', 0)
+            if created_at > cutoff:
+                # Link stories have a null story_text
+                story_text = hit.get('story_text') or ''
+                articles.append({
+                    'title': title,
+                    'url': url,
+                    'excerpt': story_text[:200] or f"AI news from Hacker News: {title}",
+                    'source': 'Hacker News',
+                    'scraped_at': scraped_at,
+                    'content': story_text[:500] or f"Read more about {title} on Hacker News."
+                })
+        
+        return articles
+    
+    def _parse_reddit(self, data: Dict, max_articles: int) -> List[Dict]:
+        """Build articles from a Reddit listing response."""
+        articles = []
+        now = datetime.now()
+        scraped_at = now.isoformat()
+        cutoff = (now - MAX_ARTICLE_AGE).timestamp()
+        
+        for post in data.get('data', {}).get('children', [])[:max_articles]:
+            post_data = post.get('data', {})
+            title = post_data.get('title')
+            if not title or post_data.get('is_self'):
+                continue
+            
+            # Filter for recent posts (last 7 days)
+            created_utc = post_data.get('created_utc', 0)
+            if created_utc > cutoff:
+                selftext = post_data.get('selftext') or ''
+                articles.append({
+                    'title': title,
+                    'url': post_data.get('url', ''),
+                    'excerpt': selftext[:200] or f"AI discussion from Reddit: {title}",
+                    'source': 'Reddit r/artificial',
+                    'scraped_at': scraped_at,
+                    'content': selftext[:500] or f"Join the discussion about {title} on Reddit."
+                })
+        
+        return articles
+    
     def scrape_rss_source(self, source_name: str, source_config: Dict, max_articles: int) -> List[Dict]:
         """Handle RSS feed sources."""
         try:
-            response = self.session.get(source_config['url'], timeout=15)
-            response.raise_for_status()
+            content = self._cached_get(source_config['url'])
             
-            soup = BeautifulSoup(response.content, 'xml')
+            soup = BeautifulSoup(content, 'xml')
             items = soup.find_all('item')
             
             articles = []
+            now = datetime.now()
+            scraped_at = now.isoformat()
+            cutoff = (now - MAX_ARTICLE_AGE).timestamp()
             for item in items[:max_articles]:
                 title = item.find('title')
                 link = item.find('link')
@@ -203,18 +497,17 @@ class AINewsScraper:
                 pub_date = item.find('pubDate')
                 
                 if title and link:
-                    title_text = title.get_text(strip=True)
-                    link_text = link.get_text(strip=True)
-                    desc_text = description.get_text(strip=True) if description else ''
+                    title_text = _node_text(title)
+                    link_text = _node_text(link)
+                    desc_text = _node_text(description) if description else ''
                     
                     # Filter for recent articles (last 7 days)
                     if pub_date:
                         try:
-                            from email.utils import parsedate_to_datetime
-                            pub_datetime = parsedate_to_datetime(pub_date.get_text())
-                            if pub_datetime < (datetime.now() - timedelta(days=7)):
+                            parsed_date = parsedate_tz(pub_date.get_text())
+                            if parsed_date and mktime_tz(parsed_date) < cutoff:
                                 continue
-                        except:
+                        except (TypeError, ValueError, OverflowError):
                             pass  # If date parsing fails, include the article anyway
                     
                     articles.append({
@@ -222,7 +515,7 @@ class AINewsScraper:
                         'url': link_text,
                         'excerpt': desc_text[:200] if desc_text else f"Latest AI news: {title_text}",
                         'source': 'AI News RSS',
-                        'scraped_at': datetime.now().isoformat(),
+                        'scraped_at': scraped_at,
                         'content': desc_text[:500] if desc_text else f"Read the full article about {title_text}."
                     })
             
@@ -235,30 +528,46 @@ class AINewsScraper:
     
     def extract_text_from_element(self, element, selector: str) -> str:
         """Extract text from an element using various selectors."""
+        return self._select_text(element, selector)[1]
+    
+    def _select_text(self, element, selector: str) -> Tuple[Optional[Tag], str]:
+        """
+        Extract text from an element using various selectors.
+        
+        Returns:
+            Tuple of (node matched by the selector itself or None, extracted text)
+        """
         if not selector:
-            return element.get_text(strip=True) if element else ''
+            return None, element.get_text(strip=True) if element else ''
         
         # Try the specific selector first
-        target = element.select_one(selector)
+        target = self._compile_selector(selector).select_one(element)
         if target:
-            return target.get_text(strip=True)
+            return target, _node_text(target)
         
         # Fallback: try common title selectors
-        for fallback_selector in ['h1', 'h2', 'h3', '.title', '[class*="title"]', 'a']:
-            target = element.select_one(fallback_selector)
-            if target and target.get_text(strip=True):
-                return target.get_text(strip=True)
+        for fallback_selector in FALLBACK_TITLE_SELECTORS:
+            target = fallback_selector.select_one(element)
+            if target:
+                text = _node_text(target)
+                if text:
+                    return None, text
         
-        return element.get_text(strip=True)[:100] if element else ''
+        return None, element.get_text(strip=True)[:100] if element else ''
     
     def extract_link_from_element(self, element, selector: str, base_url: str) -> str:
         """Extract link from an element."""
         if not selector:
             # Try to find any link in the element
-            link_elem = element.select_one('a')
+            link_elem = element.find('a')
         else:
-            link_elem = element.select_one(selector)
+            link_elem = self._compile_selector(selector).select_one(element)
         
+        return self._resolve_link(link_elem, base_url)
+    
+    @staticmethod
+    def _resolve_link(link_elem: Optional[Tag], base_url: str) -> str:
+        """Get the absolute URL a link element points to."""
         if link_elem:
             href = link_elem.get('href', '')
             if href:
@@ -269,6 +578,103 @@ class AINewsScraper:
         
         return ''
     
+    def _wait_for_host(self, url: str):
+        """Wait until a request to the URL's host is allowed (be respectful with delays)."""
+        host = urlparse(url).netloc
+        
+        with self._host_lock:
+            now = time.monotonic()
+            request_at = max(now, self._host_next_request.get(host, now))
+            self._host_next_request[host] = request_at + self.host_delay
+        
+        if request_at > now:
+            time.sleep(request_at - now)
+    
+    def _cached_get(self, url: str, timeout: int = 15, max_age: float = HTTP_CACHE_MAX_AGE,
+                    max_bytes: int = MAX_RESPONSE_BYTES, html_only: bool = False) -> bytes:
+        """
+        Fetch a URL through the on-disk cache.
+        
+        Recently cached pages are returned without a request, older ones are
+        revalidated with a conditional request, and a cached copy is used if
+        the request fails.
+        
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+            max_age: Age in seconds below which a cached page is used as is
+            max_bytes: Stop downloading the body after this many (decoded) bytes
+            html_only: Reject responses that declare a non-HTML content type
+            
+        Returns:
+            Response body
+        """
+        cached = self._lookup_response(url) if self._http_cache else None
+        
+        headers = {}
+        if cached:
+            etag, last_modified, body, fetched_at = cached
+            if time.time() - fetched_at < max_age:
+                logger.debug(f"Using fresh cached copy of {url}")
+                return body
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        try:
+            self._wait_for_host(url)
+            with self.session.get(url, timeout=timeout, headers=headers, stream=True) as response:
+                if cached and response.status_code == 304:
+                    logger.debug(f"Not modified, using cached copy of {url}")
+                    if self._http_cache:
+                        self._store_response(url, cached[0], cached[1], cached[2])
+                    return cached[2]
+                
+                response.raise_for_status()
+                
+                content_type = response.headers.get('Content-Type', '')
+                if html_only and content_type and 'html' not in content_type.lower():
+                    raise ValueError(f"Not an HTML page ({content_type})")
+                
+                body = self._read_capped(response, max_bytes)
+        except requests.RequestException as e:
+            if not cached:
+                raise
+            logger.warning(f"Request for {url} failed ({e}), using cached copy")
+            return cached[2]
+        
+        if self._http_cache:
+            self._store_response(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body)
+        
+        return body
+    
+    @staticmethod
+    def _read_capped(response: requests.Response, max_bytes: int) -> bytes:
+        """Read a streamed response body, stopping once max_bytes have been received."""
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=65536):
+            body += chunk
+            if len(body) >= max_bytes:
+                logger.debug(f"Truncated {response.url} to {max_bytes} bytes")
+                break
+        return bytes(body[:max_bytes])
+    
+    def _lookup_response(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], bytes, float]]:
+        """Read a page from the HTTP cache, treating errors (e.g. a locked database) as a miss."""
+        try:
+            return self._http_cache.get(url)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read cached copy of {url}: {e}")
+            return None
+    
+    def _store_response(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        """Store a fetched page in the HTTP cache, logging instead of failing on errors."""
+        try:
+            self._http_cache.store(url, etag, last_modified, body)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to cache {url}: {e}")
+    
     def scrape_all_sources(self, max_articles_per_source: int = 5) -> List[Dict]:
         """
         Scrape articles from all configured sources.
@@ -280,13 +686,26 @@ class AINewsScraper:
             List of all articles from all sources
         """
         all_articles = []
+        source_names = list(self.sources)
         
-        for source_name in self.sources:
-            articles = self.scrape_source(source_name, max_articles_per_source)
-            all_articles.extend(articles)
-            
-            # Be respectful with delays
-            time.sleep(2)
+        if source_names:
+            # Sources live on different hosts, so fetch them concurrently
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(source_names))) as executor:
+                results = executor.map(
+                    lambda source_name: self.scrape_source(source_name, max_articles_per_source),
+                    source_names
+                )
+                # The same story is often posted to several sources; keep its first copy.
+                # Articles without a link of their own carry their listing page's URL, so
+                # those URLs don't identify a story
+                listing_urls = {source_config['url'] for source_config in self.sources.values()}
+                seen_urls = set()
+                for articles in results:
+                    for article in articles:
+                        url = article['url']
+                        if url in listing_urls or url not in seen_urls:
+                            seen_urls.add(url)
+                            all_articles.append(article)
         
         logger.info(f"Total articles scraped: {len(all_articles)}")
         return all_articles
@@ -302,39 +721,45 @@ class AINewsScraper:
             Article content as text
         """
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(self._cached_get(url, max_bytes=ARTICLE_MAX_BYTES, html_only=True), HTML_PARSER)
             
             # Try different content selectors
-            content_selectors = [
-                '.article-content',
-                '.entry-content', 
-                '.post-content',
-                'article',
-                '.content',
-                '[class*="content"]'
-            ]
-            
             content = ""
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
+            for selector in CONTENT_SELECTORS:
+                content_elem = selector.select_one(soup)
                 if content_elem:
                     # Remove script and style elements
                     for script in content_elem(["script", "style"]):
                         script.decompose()
                     
-                    content = content_elem.get_text()
-                    content = ' '.join(content.split())  # Clean whitespace
+                    # Clean whitespace and limit content length
+                    content = _normalize_whitespace(content_elem.get_text(), ARTICLE_MAX_CHARS)
                     break
             
-            return content[:5000]  # Limit content length
+            return content
             
         except Exception as e:
             logger.error(f"Error scraping content from {url}: {e}")
             return ""
     
+    def scrape_article_contents(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Scrape the full content of several articles concurrently.
+        
+        Args:
+            urls: URLs of the articles to scrape
+            
+        Returns:
+            Dictionary mapping each URL to its content (empty string on failure)
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            contents = executor.map(self.scrape_article_content, unique_urls)
+            return dict(zip(unique_urls, contents))
+    
     def get_latest_ai_news(self, max_total_articles: int = 8) -> List[Dict]:
         """
         Get the latest AI news from all sources.
@@ -358,89 +783,27 @@ class AINewsScraper:
         
         logger.info(f"Successfully scraped {len(articles)} real articles")
         
-        # Sort by scraped time (most recent first)
-        articles.sort(key=lambda x: x['scraped_at'], reverse=True)
-        
-        # Return only the requested number
-        return articles[:max_total_articles]
+        # Return only the requested number, later sources first. Sources are fetched
+        # concurrently, so scraped_at reflects network timing and can't order them
+        return articles[::-1][:max_total_articles]
     
     def generate_fallback_articles(self, count: int = 8) -> List[Dict]:
         """Generate fallback AI news articles when scraping fails."""
         current_date = datetime.now().isoformat()
         
-        fallback_articles = [
+        return [
             {
-                'title': 'Major Breakthrough in AI Language Understanding',
-                'url': 'https://example.com/ai-breakthrough',
-                'excerpt': 'Researchers announce significant improvements in AI reasoning capabilities and natural language understanding.',
-                'source': 'AI Research Today',
+                'title': title,
+                'url': url,
+                'excerpt': excerpt,
+                'source': source,
                 'scraped_at': current_date,
-                'content': 'Recent developments in artificial intelligence have led to unprecedented improvements in language model capabilities...'
-            },
-            {
-                'title': 'New AI Regulations Proposed by Global Tech Leaders',
-                'url': 'https://example.com/ai-regulations',
-                'excerpt': 'Technology leaders propose comprehensive framework for AI governance and safety standards.',
-                'source': 'Tech Policy News',
-                'scraped_at': current_date,
-                'content': 'Industry executives and policymakers are collaborating on new guidelines for responsible AI development...'
-            },
-            {
-                'title': 'AI in Healthcare Shows Promising Clinical Trial Results',
-                'url': 'https://example.com/ai-healthcare',
-                'excerpt': 'Medical AI applications demonstrate significant improvements in diagnostic accuracy and patient outcomes.',
-                'source': 'Medical AI Journal',
-                'scraped_at': current_date,
-                'content': 'Clinical trials of AI-powered diagnostic tools show remarkable success rates in early disease detection...'
-            },
-            {
-                'title': 'The Ethics of Autonomous AI Systems Under Scrutiny',
-                'url': 'https://example.com/ai-ethics',
-                'excerpt': 'Philosophers and technologists debate the moral implications of increasingly autonomous AI systems.',
-                'source': 'Philosophy & Tech',
-                'scraped_at': current_date,
-                'content': 'As AI systems become more autonomous, questions about responsibility and ethical decision-making become crucial...'
-            },
-            {
-                'title': 'AI Transforms Creative Industries with New Generative Tools',
-                'url': 'https://example.com/creative-ai',
-                'excerpt': 'Artists and creators embrace AI-powered tools for music, visual art, and content generation.',
-                'source': 'Creative Tech Weekly',
-                'scraped_at': current_date,
-                'content': 'The intersection of AI and creativity is producing innovative tools that enhance human artistic expression...'
-            },
-            {
-                'title': 'Quantum Computing Breakthrough Accelerates AI Development',
-                'url': 'https://example.com/quantum-ai',
-                'excerpt': 'New quantum algorithms show promise for solving complex AI problems exponentially faster than classical computers.',
-                'source': 'Quantum Tech News',
-                'scraped_at': current_date,
-                'content': 'Quantum computing researchers have developed new algorithms that could revolutionize machine learning and AI optimization...'
-            },
-            {
-                'title': 'AI-Powered Climate Solutions Gain Global Recognition',
-                'url': 'https://example.com/ai-climate',
-                'excerpt': 'Artificial intelligence is being deployed to tackle climate change through predictive modeling and optimization.',
-                'source': 'Climate Tech Weekly',
-                'scraped_at': current_date,
-                'content': 'Climate scientists and AI researchers are collaborating to develop solutions for monitoring and mitigating climate change...'
-            },
-            {
-                'title': 'Edge AI Revolutionizes IoT and Mobile Applications',
-                'url': 'https://example.com/edge-ai',
-                'excerpt': 'On-device AI processing is transforming how mobile and IoT devices operate with improved privacy and performance.',
-                'source': 'Edge Computing Today',
-                'scraped_at': current_date,
-                'content': 'Edge AI is enabling real-time processing on devices without requiring cloud connectivity, improving privacy and reducing latency...'
+                'content': content
             }
+            for title, url, excerpt, source, content in FALLBACK_ARTICLES[:count]
         ]
-        
-        return fallback_articles[:count]
 
 if __name__ == "__main__":
-    import json
-    import sys
-    
     # Check if running in quiet mode (when called from Node.js)
     quiet_mode = len(sys.argv) > 1 and sys.argv[1] == '--quiet'
     
@@ -449,7 +812,7 @@ if __name__ == "__main__":
         logging.basicConfig(level=logging.CRITICAL)
         scraper = AINewsScraper()
         latest_news = scraper.get_latest_ai_news(max_total_articles=8)
-        print(json.dumps(latest_news, indent=2))
+        _print_json(latest_news)
     else:
         # Enable verbose logging for manual testing
         logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -468,4 +831,4 @@ if __name__ == "__main__":
         print("DEBUG: Getting latest AI news...")
         latest_news = scraper.get_latest_ai_news(max_total_articles=8)
         print(f"DEBUG: Final result: {len(latest_news)} articles")
-        print(json.dumps(latest_news, indent=2))
+        _print_json(latest_news)
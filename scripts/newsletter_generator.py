@@ -12,6 +12,7 @@ import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from html import escape
 from pathlib import Path
 
 # Get the absolute path to the scripts directory
@@ -44,52 +45,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class NewsletterGenerator:
-    """
-    Generates and sends AI newsletter using the news scraper and Gemini AI.
-    """
-    
-    def __init__(self):
-        self.scraper = AINewsScraper()
-        self.processor = ArticleProcessor()
-        self.summarizer = GeminiSummarizer()
-        
-        # Email configuration
-        self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-        self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
-        self.sender_email = os.getenv('SENDER_EMAIL')
-        self.sender_password = os.getenv('SENDER_PASSWORD')
-        
-        if not self.sender_email or not self.sender_password:
-            logger.warning("Email credentials not configured")
-    
-    def get_subscribers(self):
-        """Get list of active subscribers."""
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        subscribers_file = Path(project_root) / 'subscribers.json'
-        
-        try:
-            if subscribers_file.exists():
-                with open(subscribers_file, 'r') as f:
-                    subscribers = json.load(f)
-                    return [sub['email'] for sub in subscribers if sub.get('active', True)]
-        except Exception as e:
-            logger.error(f"Error reading subscribers file: {e}")
-            
-        return []
-    
-    def generate_newsletter_html(self, articles, intro_text=""):
-        """Generate HTML newsletter content."""
-        if not articles:
-            return None
-        
-        # Use Gemini to generate intro if available and not provided
-        if not intro_text and self.summarizer.is_available():
-            intro_text = self.summarizer.generate_newsletter_intro(articles)
-        elif not intro_text:
-            intro_text = "Welcome to this week's AI news roundup. Here are the latest developments in artificial intelligence and technology."
-        
-        html_content = f"""
+# Recipients per SMTP transaction
+SMTP_BATCH_SIZE = 50
+
+# Static newsletter skeleton, filled in with str.format
+NEWSLETTER_HEADER = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -129,31 +89,93 @@ class NewsletterGenerator:
                 <div class="header">
                     <h1>QuanticDaily</h1>
                     <p>Your Weekly AI News Digest</p>
-                    <p>{datetime.now().strftime('%B %d, %Y')}</p>
+                    <p>{date}</p>
                 </div>
                 
                 <div class="intro">
-                    <p>{intro_text}</p>
+                    <p>{intro}</p>
                 </div>
                 
                 <div class="content">
         """
+
+NEWSLETTER_FOOTER = """
+                </div>
+                
+                <div class="footer">
+                    <p><strong>Thank you for reading QuanticDaily!</strong></p>
+                    <p>Curated AI news powered by advanced algorithms</p>
+                    <p class="small">© {year} QuanticDaily. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+class NewsletterGenerator:
+    """
+    Generates and sends AI newsletter using the news scraper and Gemini AI.
+    """
+    
+    def __init__(self):
+        self.scraper = AINewsScraper()
+        self.processor = ArticleProcessor()
+        self.summarizer = GeminiSummarizer()
+        
+        # Email configuration
+        self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
+        self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
+        self.sender_email = os.getenv('SENDER_EMAIL')
+        self.sender_password = os.getenv('SENDER_PASSWORD')
+        
+        if not self.sender_email or not self.sender_password:
+            logger.warning("Email credentials not configured")
+    
+    def get_subscribers(self):
+        """Get list of active subscribers."""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subscribers_file = Path(project_root) / 'subscribers.json'
+        
+        try:
+            if subscribers_file.exists():
+                with open(subscribers_file, 'r') as f:
+                    subscribers = json.load(f)
+                    return [sub['email'] for sub in subscribers if sub.get('active', True)]
+        except Exception as e:
+            logger.error(f"Error reading subscribers file: {e}")
+            
+        return []
+    
+    def generate_newsletter_html(self, articles, intro_text=""):
+        """Generate HTML newsletter content."""
+        if not articles:
+            return None
+        
+        # Use Gemini to generate intro if available and not provided
+        if not intro_text and self.summarizer.is_available():
+            intro_text = self.summarizer.generate_newsletter_intro(articles)
+        elif not intro_text:
+            intro_text = "Welcome to this week's AI news roundup. Here are the latest developments in artificial intelligence and technology."
+        
+        now = datetime.now()
+        parts = [NEWSLETTER_HEADER.format(date=now.strftime('%B %d, %Y'), intro=escape(intro_text))]
         
         for i, article in enumerate(articles, 1):
-            title = article.get('title', 'Untitled Article')
+            title = escape(article.get('title', 'Untitled Article'))
             summary = article.get('summary', 'No summary available.')
             topics = article.get('topics', [])
             source = article.get('source', 'Unknown').replace('_', ' ').title()
             relevance_score = article.get('relevance_score', 0)
-            article_url = article.get('url', '')
+            article_url = escape(article.get('url', ''), quote=True)
             
             # Truncate summary if too long
             if len(summary) > 500:
                 summary = summary[:500] + "..."
+            summary = escape(summary)
             
             topics_html = ""
             if topics:
-                topics_html = '<div class="topics">' + ''.join([f'<span class="topic">{topic}</span>' for topic in topics[:4]]) + '</div>'
+                topics_html = '<div class="topics">' + ''.join([f'<span class="topic">{escape(topic)}</span>' for topic in topics[:4]]) + '</div>'
             
             score_html = f'<span class="score">★ {relevance_score:.1f}</span>' if relevance_score > 0 else ''
             
@@ -165,7 +187,7 @@ class NewsletterGenerator:
                 title_html = f'<h2>{i}. {title}</h2>'
                 read_more_html = ''
             
-            html_content += f"""
+            parts.append(f"""
                     <div class="article">
                         {title_html}
                         <div class="summary">{summary}</div>
@@ -178,22 +200,11 @@ class NewsletterGenerator:
                             </div>
                         </div>
                     </div>
-            """
+            """)
         
-        html_content += f"""
-                </div>
-                
-                <div class="footer">
-                    <p><strong>Thank you for reading QuanticDaily!</strong></p>
-                    <p>Curated AI news powered by advanced algorithms</p>
-                    <p class="small">© {datetime.now().year} QuanticDaily. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        parts.append(NEWSLETTER_FOOTER.format(year=now.year))
         
-        return html_content
+        return ''.join(parts)
     
     def send_newsletter(self, subscribers, html_content, subject=None):
         """Send newsletter to all subscribers."""
@@ -208,40 +219,56 @@ class NewsletterGenerator:
         if not subject:
             subject = f"QuanticDaily - AI News Weekly ({datetime.now().strftime('%B %d, %Y')})"
         
+        # Build the message once; recipients only travel in the envelope
+        msg = MIMEMultipart('alternative')
+        msg['From'] = f"QuanticDaily <{self.sender_email}>"
+        msg['To'] = "undisclosed-recipients:;"
+        msg['Subject'] = subject
+        msg.attach(MIMEText(html_content, 'html'))
+        raw_message = msg.as_bytes()
+        
         try:
-            # Create SMTP session
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.sender_email, self.sender_password)
-            
-            successful_sends = 0
-            
-            # Send email to each subscriber
-            for email in subscribers:
-                try:
-                    msg = MIMEMultipart('alternative')
-                    msg['From'] = f"QuanticDaily <{self.sender_email}>"
-                    msg['To'] = email
-                    msg['Subject'] = subject
-                    
-                    html_part = MIMEText(html_content, 'html')
-                    msg.attach(html_part)
-                    
-                    server.send_message(msg)
-                    logger.info(f"Newsletter sent to {email}")
-                    successful_sends += 1
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send to {email}: {e}")
-            
-            server.quit()
-            
-            logger.info(f"Newsletter sent to {successful_sends}/{len(subscribers)} subscribers")
-            return successful_sends > 0
-            
+            server = self._connect_smtp()
         except Exception as e:
             logger.error(f"Error sending newsletters: {e}")
             return False
+        
+        successful_sends = 0
+        
+        # Send to subscribers in BCC batches
+        for start in range(0, len(subscribers), SMTP_BATCH_SIZE):
+            batch = subscribers[start:start + SMTP_BATCH_SIZE]
+            try:
+                try:
+                    refused = server.sendmail(self.sender_email, batch, raw_message)
+                except smtplib.SMTPServerDisconnected:
+                    logger.warning("SMTP connection dropped, reconnecting")
+                    server = self._connect_smtp()
+                    refused = server.sendmail(self.sender_email, batch, raw_message)
+                
+                for email, error in refused.items():
+                    logger.error(f"Failed to send to {email}: {error}")
+                successful_sends += len(batch) - len(refused)
+                logger.info(f"Newsletter sent to batch of {len(batch) - len(refused)} subscribers")
+                
+            except Exception as e:
+                logger.error(f"Failed to send batch starting at {batch[0]}: {e}")
+        
+        # The session may already be gone (e.g. a failed reconnect); that does not undo the sends
+        try:
+            server.quit()
+        except smtplib.SMTPException as e:
+            logger.warning(f"Error closing SMTP connection: {e}")
+        
+        logger.info(f"Newsletter sent to {successful_sends}/{len(subscribers)} subscribers")
+        return successful_sends > 0
+    
+    def _connect_smtp(self):
+        """Open an authenticated SMTP session."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.starttls()
+        server.login(self.sender_email, self.sender_password)
+        return server
     
     def generate_and_send_newsletter(self):
         """Main function to generate and send newsletter."""
@@ -267,10 +294,10 @@ class NewsletterGenerator:
         
         # Scrape full content for each article
         logger.info("Enriching articles with full content...")
+        contents = self.scraper.scrape_article_contents([article.get('url') for article in raw_articles])
         for article in raw_articles:
             if article.get('url'):
-                content = self.scraper.scrape_article_content(article['url'])
-                article['content'] = content
+                article['content'] = contents.get(article['url'], '')
         
         # Process articles
         logger.info("Processing articles...")
@@ -5,7 +5,7 @@ Utility functions for the QuanticDaily newsletter system.
 import hashlib
 import os
 from datetime import datetime
-from urllib.parse import urlencode
+from urllib.parse import quote_plus
 
 def generate_unsubscribe_token(email: str) -> str:
     """Generate an unsubscribe token for the given email."""
@@ -17,9 +17,9 @@ def generate_unsubscribe_link(email: str, base_url: str = None) -> str:
     if base_url is None:
         base_url = os.getenv('BASE_URL', 'https://quanticdaily.vercel.app')
     
+    # The token is a hex digest and needs no quoting
     token = generate_unsubscribe_token(email)
-    params = urlencode({'token': token, 'email': email})
-    return f"{base_url}/unsubscribe?{params}"
+    return f"{base_url}/unsubscribe?token={token}&email={quote_plus(email)}"
 
 def get_unsubscribe_footer_html(email: str) -> str:
     """Generate HTML footer with unsubscribe link."""
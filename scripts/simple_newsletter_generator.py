@@ -7,15 +7,21 @@ This version can be used as a fallback or standalone newsletter system.
 import sys
 import os
 import json
+import re
+import sqlite3
 import smtplib
-import time
 import requests
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.message import EmailMessage
 from datetime import datetime
+from html import escape
 import logging
 from pathlib import Path
 from bs4 import BeautifulSoup
+import soupsieve
 
 # Import newsletter utilities
 try:
@@ -37,6 +43,20 @@ except ImportError:
         </div>
         """
 
+# Prefer the C-based lxml parser, fall back to Python's built-in parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Share GeminiSummarizer's response cache, so re-runs over unchanged pages skip the API
+try:
+    from gemini_integration import ResponseCache, GEMINI_CACHE_PATH
+except ImportError:
+    # Fallback if gemini_integration is not available
+    ResponseCache = None
+
 # Try to import Gemini API
 try:
     import google.generativeai as genai
@@ -52,6 +72,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Selectors tried in order to find an article's title and main content
+TITLE_SELECTORS = tuple(
+    soupsieve.compile(selector) for selector in ('h1', '.article-title', '.entry-title', 'title')
+)
+CONTENT_SELECTORS = tuple(
+    soupsieve.compile(selector) for selector in (
+        '.article-content', '.entry-content', '.post-content', 'article', '.content'
+    )
+)
+
+# Punctuation that ends a sentence when followed by whitespace
+SENTENCE_END = re.compile(r'[.!?](?=\s)')
+
+# RFC 5322 limit on line length, which 8-bit message bodies must respect
+MAX_8BIT_LINE_LENGTH = 998
+
+# Static newsletter skeleton; only the header takes a date
+NEWSLETTER_HEADER = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>QuanticDaily - AI News Weekly</title>
+            <style>
+                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
+                .container {{ max-width: 600px; margin: 0 auto; background-color: white; border-radius: 10px; overflow: hidden; }}
+                .header {{ background: linear-gradient(135deg, #4a5e42 0%, #7a8f72 50%, #c8d3c1 100%); color: white; padding: 30px; text-align: center; }}
+                .header h1 {{ margin: 0; font-size: 24px; font-weight: bold; }}
+                .header p {{ margin: 10px 0 0 0; opacity: 0.9; }}
+                .content {{ padding: 30px; }}
+                .article {{ margin-bottom: 30px; border-bottom: 1px solid #eee; padding-bottom: 20px; }}
+                .article:last-child {{ border-bottom: none; }}
+                .article h2 {{ color: #333; font-size: 18px; margin: 0 0 10px 0; }}
+                .article h2 a {{ color: #333; text-decoration: none; }}
+                .article h2 a:hover {{ color: #1976d2; text-decoration: underline; }}
+                .article .summary {{ color: #666; line-height: 1.6; margin-bottom: 10px; }}
+                .article .read-more {{ margin: 10px 0; }}
+                .read-more-btn {{ display: inline-block; background-color: #1976d2; color: white; padding: 6px 12px; text-decoration: none; border-radius: 4px; font-size: 12px; }}
+                .read-more-btn:hover {{ background-color: #1565c0; }}
+                .article .topics {{ margin-top: 10px; }}
+                .topic {{ display: inline-block; background-color: #f0f0f0; color: #666; padding: 4px 8px; border-radius: 12px; font-size: 12px; margin-right: 5px; }}
+                .footer {{ background-color: #f8f8f8; padding: 20px; text-align: center; color: #666; font-size: 12px; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>QuanticDaily</h1>
+                    <p>Your Weekly AI News Digest</p>
+                    <p>{date}</p>
+                </div>
+                
+                <div class="content">
+                    <h3>This Week in AI</h3>
+                    <p>Here are the latest AI and technology developments:</p>
+        """
+
+NEWSLETTER_FOOTER = """
+                </div>
+                
+                <div class="footer">
+                    <p>Thank you for reading QuanticDaily!</p>
+                    <p>© 2025 QuanticDaily. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+def _trim_to_sentence(text: str, max_chars: int) -> str:
+    """Cut text to at most max_chars, ending on a sentence boundary, or a word boundary if none is near."""
+    if len(text) <= max_chars:
+        return text
+    
+    window = text[:max_chars + 1]
+    last_end = None
+    for last_end in SENTENCE_END.finditer(window):
+        pass
+    if last_end and last_end.end() > max_chars // 2:
+        return window[:last_end.end()]
+    
+    space = window.rfind(' ')
+    return window[:space] if space > 0 else text[:max_chars]
+
 class SimpleNewsletterGenerator:
     def __init__(self):
         # Load environment variables
@@ -60,6 +165,24 @@ class SimpleNewsletterGenerator:
         
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
         self.gemini_model = None
+        self.max_workers = 5
+        self.max_concurrent_requests = 3  # Gemini requests sent in parallel
+        self.force_refresh = os.getenv('GEMINI_FORCE_REFRESH', '').lower() in ('1', 'true', 'yes')
+        self._cache = None
+        
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        
+        # Pool connections for every worker, and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         if GEMINI_AVAILABLE and self.gemini_api_key:
             try:
@@ -70,6 +193,13 @@ class SimpleNewsletterGenerator:
                 logger.error(f"Failed to initialize Gemini: {e}")
         else:
             logger.warning("Gemini API not available or not configured")
+        
+        # Cache of previous Gemini results, only needed once the API can be used
+        if self.gemini_model and ResponseCache is not None:
+            try:
+                self._cache = ResponseCache(GEMINI_CACHE_PATH)
+            except sqlite3.Error as e:
+                logger.warning(f"Gemini cache disabled: {e}")
     
     def get_subscribers(self):
         """Get list of active subscribers from the subscribers.json file."""
@@ -87,28 +217,27 @@ class SimpleNewsletterGenerator:
     
     def scrape_simple_article(self, url):
         """Simple article scraping without the full pipeline."""
+        logger.info(f"Scraping: {url}")
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             
             # Try to extract title
             title = None
-            for selector in ['h1', '.article-title', '.entry-title', 'title']:
-                element = soup.select_one(selector)
-                if element and element.get_text().strip():
-                    title = element.get_text().strip()
-                    break
+            for selector in TITLE_SELECTORS:
+                element = selector.select_one(soup)
+                if element:
+                    text = element.get_text().strip()
+                    if text:
+                        title = text
+                        break
             
             # Try to extract content
             content = ""
-            for selector in ['.article-content', '.entry-content', '.post-content', 'article', '.content']:
-                element = soup.select_one(selector)
+            for selector in CONTENT_SELECTORS:
+                element = selector.select_one(soup)
                 if element:
                     # Get text and clean it up
                     content = element.get_text()
@@ -118,7 +247,7 @@ class SimpleNewsletterGenerator:
             return {
                 'url': url,
                 'title': title or 'Untitled Article',
-                'content': content[:2000] if content else 'Content not available',  # Limit content
+                'content': _trim_to_sentence(content, 2000) if content else 'Content not available',  # Limit content
                 'scraped_at': datetime.now().isoformat()
             }
             
@@ -188,6 +317,81 @@ class SimpleNewsletterGenerator:
             logger.error(f"Error extracting topics: {e}")
             return ["AI", "Technology"]
     
+    def summarize_and_tag(self, article_text, title=""):
+        """Summarize an article and extract its topics with a single Gemini request."""
+        if not self.gemini_model:
+            return "Summary not available (Gemini API not configured)", ["AI", "Technology"]
+        
+        excerpt = article_text[:3000]
+        cache_key = None
+        if self._cache is not None:
+            cache_key = ResponseCache.key('simple', title, excerpt)
+            cached = None if self.force_refresh else self._cache.get(cache_key)
+            if cached is not None:
+                return cached[0], cached[1]
+        
+        summary = None
+        topics = None
+        
+        try:
+            prompt = f"""
+            Please provide a concise, professional summary of the following AI/technology article. 
+            Focus on the key points, implications, and relevance to AI professionals.
+            Keep the summary between 150-300 words.
+            Also extract 3-5 relevant topics or tags, focusing on specific technologies, companies, concepts, or trends mentioned.
+            
+            Return only a JSON object with the keys "summary" (a string) and "topics" (a list of strings).
+            
+            Title: {title}
+            
+            Article Content:
+            {excerpt}
+            """
+            
+            response = self.gemini_model.generate_content(
+                prompt,
+                generation_config={'response_mime_type': 'application/json'}
+            )
+            
+            text = response.text.strip()
+            if text.startswith('```'):
+                # Strip a Markdown code fence around the JSON
+                text = text.strip('`')
+                text = text[4:] if text.startswith('json') else text
+            
+            result = json.loads(text)
+            if isinstance(result, dict):
+                summary = result.get('summary')
+                topics = result.get('topics')
+            else:
+                logger.warning("Unexpected combined response format from Gemini")
+                
+        except Exception as e:
+            logger.warning(f"Error generating combined summary and topics: {e}")
+        
+        if isinstance(summary, str) and summary.strip():
+            summary = summary.strip()
+        else:
+            summary = None
+        
+        if isinstance(topics, list):
+            topics = [str(topic).strip() for topic in topics]
+            topics = [t for t in topics if t and len(t) > 2][:5]
+        
+        # Only complete combined responses are cached; fallback results may be error placeholders
+        if summary and topics:
+            if self._cache is not None:
+                self._cache.store(cache_key, [summary, topics])
+            return summary, topics
+        
+        # Fall back to separate requests for anything missing from the response
+        if not summary:
+            summary = self.summarize_with_gemini(article_text, title)
+        if not topics:
+            topics = self.extract_topics_with_gemini(article_text, title)
+        
+        return summary, topics
+    
     def scrape_weekly_news(self):
         """Scrape AI news from various sources."""
         # Sample AI news URLs
@@ -197,29 +401,29 @@ class SimpleNewsletterGenerator:
             "https://www.artificialintelligence-news.com/",
         ]
         
-        articles = []
+        # Each source is a different host, so fetch them all at once
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            scraped = list(executor.map(self.scrape_simple_article, urls))
         
-        for url in urls:
-            logger.info(f"Scraping: {url}")
-            article = self.scrape_simple_article(url)
-            
-            if article and len(article['content']) > 100:
-                # Enhance with Gemini if available
-                if self.gemini_model:
-                    article['summary'] = self.summarize_with_gemini(article['content'], article['title'])
-                    article['topics'] = self.extract_topics_with_gemini(article['content'], article['title'])
-                else:
-                    article['summary'] = article['content'][:300] + "..."
-                    article['topics'] = ["AI", "Technology"]
-                
-                articles.append(article)
-                
-                # Small delay to be respectful
-                time.sleep(2)
-            
-            # Limit to 5 articles for testing
-            if len(articles) >= 5:
-                break
+        # Limit to 5 articles for testing
+        articles = [article for article in scraped if article and len(article['content']) > 100][:5]
+        if not articles:
+            return articles
+        
+        # Enhance with Gemini if available, a few requests at a time
+        if self.gemini_model:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrent_requests, len(articles))) as executor:
+                results = list(executor.map(
+                    lambda article: self.summarize_and_tag(article['content'], article['title']),
+                    articles
+                ))
+            for article, (summary, topics) in zip(articles, results):
+                article['summary'] = summary
+                article['topics'] = topics
+        else:
+            for article in articles:
+                article['summary'] = article['content'][:300] + "..."
+                article['topics'] = ["AI", "Technology"]
         
         return articles
     
@@ -228,60 +432,22 @@ class SimpleNewsletterGenerator:
         if not articles:
             return None
             
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>QuanticDaily - AI News Weekly</title>
-            <style>
-                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 600px; margin: 0 auto; background-color: white; border-radius: 10px; overflow: hidden; }}
-                .header {{ background: linear-gradient(135deg, #4a5e42 0%, #7a8f72 50%, #c8d3c1 100%); color: white; padding: 30px; text-align: center; }}
-                .header h1 {{ margin: 0; font-size: 24px; font-weight: bold; }}
-                .header p {{ margin: 10px 0 0 0; opacity: 0.9; }}
-                .content {{ padding: 30px; }}
-                .article {{ margin-bottom: 30px; border-bottom: 1px solid #eee; padding-bottom: 20px; }}
-                .article:last-child {{ border-bottom: none; }}
-                .article h2 {{ color: #333; font-size: 18px; margin: 0 0 10px 0; }}
-                .article h2 a {{ color: #333; text-decoration: none; }}
-                .article h2 a:hover {{ color: #1976d2; text-decoration: underline; }}
-                .article .summary {{ color: #666; line-height: 1.6; margin-bottom: 10px; }}
-                .article .read-more {{ margin: 10px 0; }}
-                .read-more-btn {{ display: inline-block; background-color: #1976d2; color: white; padding: 6px 12px; text-decoration: none; border-radius: 4px; font-size: 12px; }}
-                .read-more-btn:hover {{ background-color: #1565c0; }}
-                .article .topics {{ margin-top: 10px; }}
-                .topic {{ display: inline-block; background-color: #f0f0f0; color: #666; padding: 4px 8px; border-radius: 12px; font-size: 12px; margin-right: 5px; }}
-                .footer {{ background-color: #f8f8f8; padding: 20px; text-align: center; color: #666; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>QuanticDaily</h1>
-                    <p>Your Weekly AI News Digest</p>
-                    <p>{datetime.now().strftime('%B %d, %Y')}</p>
-                </div>
-                
-                <div class="content">
-                    <h3>This Week in AI</h3>
-                    <p>Here are the latest AI and technology developments:</p>
-        """
+        parts = [NEWSLETTER_HEADER.format(date=datetime.now().strftime('%B %d, %Y'))]
         
         for article in articles:
-            title = article.get('title', 'Untitled Article')
+            title = escape(article.get('title', 'Untitled Article'))
             summary = article.get('summary', 'No summary available.')
             topics = article.get('topics', [])
-            article_url = article.get('url', '')
+            article_url = escape(article.get('url', ''), quote=True)
             
             # Truncate summary if too long
             if len(summary) > 400:
                 summary = summary[:400] + "..."
+            summary = escape(summary)
             
             topics_html = ""
             if topics:
-                topics_html = '<div class="topics">' + ''.join([f'<span class="topic">{topic}</span>' for topic in topics[:3]]) + '</div>'
+                topics_html = '<div class="topics">' + ''.join([f'<span class="topic">{escape(topic)}</span>' for topic in topics[:3]]) + '</div>'
             
             # Create clickable title and read more button
             if article_url:
@@ -291,28 +457,18 @@ class SimpleNewsletterGenerator:
                 title_html = f'<h2>{title}</h2>'
                 read_more_html = ''
             
-            html_content += f"""
+            parts.append(f"""
                     <div class="article">
                         {title_html}
                         <div class="summary">{summary}</div>
                         {read_more_html}
                         {topics_html}
                     </div>
-            """
+            """)
         
-        html_content += f"""
-                </div>
-                
-                <div class="footer">
-                    <p>Thank you for reading QuanticDaily!</p>
-                    <p>© 2025 QuanticDaily. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        parts.append(NEWSLETTER_FOOTER)
         
-        return html_content
+        return ''.join(parts)
     
     def send_newsletter(self, subscribers, html_content):
         """Send newsletter to all subscribers."""
@@ -330,27 +486,36 @@ class SimpleNewsletterGenerator:
             logger.error("Email credentials not configured")
             return False
         
+        # Headers shared by every message
+        from_header = f"QuanticDaily <{sender_email}>"
+        subject = f"QuanticDaily - AI News Weekly ({datetime.now().strftime('%B %d, %Y')})"
+        
         try:
             # Create SMTP session
             server = smtplib.SMTP(smtp_server, smtp_port)
             server.starttls()
             server.login(sender_email, sender_password)
             
-            # Send email to each subscriber
+            # Send the HTML unencoded when the server accepts 8-bit bodies and no line is too long
+            send_8bit = server.has_extn('8bitmime') and all(
+                len(line) <= MAX_8BIT_LINE_LENGTH for line in html_content.encode('utf-8').splitlines()
+            )
+            cte = '8bit' if send_8bit else None
+            mail_options = ('BODY=8BITMIME',) if send_8bit else ()
+            
+            # Send email to each subscriber; the unsubscribe footer differs, so no BCC batching
             for email in subscribers:
                 try:
                     # Personalize content with unsubscribe link
                     personalized_content = html_content + get_unsubscribe_footer_html(email)
                     
-                    msg = MIMEMultipart('alternative')
-                    msg['From'] = f"QuanticDaily <{sender_email}>"
+                    msg = EmailMessage(policy=policy.SMTP)
+                    msg['From'] = from_header
                     msg['To'] = email
-                    msg['Subject'] = f"QuanticDaily - AI News Weekly ({datetime.now().strftime('%B %d, %Y')})"
-                    
-                    html_part = MIMEText(personalized_content, 'html')
-                    msg.attach(html_part)
+                    msg['Subject'] = subject
+                    msg.set_content(personalized_content, subtype='html', cte=cte)
                     
-                    server.send_message(msg)
+                    server.sendmail(sender_email, [email], msg.as_bytes(), mail_options)
                     logger.info(f"Newsletter sent to {email}")
                     
                 except Exception as e: